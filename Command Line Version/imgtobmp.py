@@ -7,10 +7,23 @@ Usage:
     python imgtobitmap.py image.png 4 -o image.py
 """
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # optional; a slower pure-Python path is used without it
+
 from PIL import Image
 import argparse
 from pathlib import Path
 
+if np is not None:
+    # (256, 4) table: row i holds the four ASCII bytes of '\xNN' for byte
+    # value i, so fancy-indexing with the bitmap escapes the whole buffer
+    # in one C-level pass.
+    _ESC_NP = np.frombuffer(
+        b''.join(b'\\x%02x' % i for i in range(256)), dtype=np.uint8
+    ).reshape(256, 4)
+
 
 def main():
 
@@ -32,6 +45,13 @@ def main():
         '-o', '--output',
         help='Output .py filename (optional)')
 
+    parser.add_argument(
+        '--raw',
+        action='store_true',
+        help='Write the bitmap to a raw .bin sidecar file instead of '
+             'inlining it in the .py (smaller and faster, but the .bin '
+             'must be copied alongside the .py)')
+
     args = parser.parse_args()
 
     bits = args.bits_per_pixel
@@ -42,43 +62,112 @@ def main():
     if bits == 1:
         # Force strict black/white threshold
         img = img.convert("L")  # grayscale
-        img = img.point(lambda p: 255 if p > 127 else 0, mode='1')
-        img = img.convert("P")
+        # Prebuilt 256-entry LUT: PIL consumes it directly in C instead of
+        # calling a Python lambda per gray level.
+        img = img.point([0] * 128 + [255] * 128, mode='1')
 
-        # Force palette manually: index 0 = black, 1 = white
-        img.putpalette([
-            0, 0, 0,       # black
-            255, 255, 255  # white
-        ] + [0, 0, 0] * 254)
+        # Mode "1" is already an MSB-first packed bitmap with a fixed
+        # two-entry palette: index 0 = black, 1 = white. No P round-trip.
+        colors = ['0x0000', '0xffff']
 
     else:
-        img = img.convert("P", palette=Image.ADAPTIVE, colors=2**bits)
+        # Already-paletted inputs whose indices fit in 2**bits colors can
+        # skip the ADAPTIVE median-cut re-quantization entirely.
+        used = img.getcolors(maxcolors=1 << bits) if img.mode == "P" else None
+        if used is None or max(index for _, index in used) >= 1 << bits:
+            img = img.convert("P", palette=Image.ADAPTIVE, colors=2**bits)
+
+        palette = img.getpalette()
+
+        # Zero-pad: newer Pillow versions return only the used entries.
+        pal_size = 3 * (1 << bits)
+        palette = (palette[:pal_size] + [0] * pal_size)[:pal_size]
+
+        if np is not None:
+            pal = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)
+
+            color565 = (
+                ((pal[:, 0] & 0xF8).astype(np.uint16) << 8)
+                | ((pal[:, 1] & 0xFC).astype(np.uint16) << 3)
+                | (pal[:, 2] >> 3)
+            )
+
+            # swap bytes
+            color565 = color565.byteswap()
+            colors = [f'0x{c:04x}' for c in color565.tolist()]
+        else:
+            colors = []
+            for color in range(1 << bits):
+                color565 = (
+                    ((palette[color*3] & 0xF8) << 8)
+                    | ((palette[color*3+1] & 0xFC) << 3)
+                    | (palette[color*3+2] >> 3)
+                )
+
+                # swap bytes
+                color565 = ((color565 & 0xff) << 8) + ((color565 & 0xff00) >> 8)
+                colors.append(f'0x{color565:04x}')
+
+    bitmap_bits = img.width * img.height * bits
 
-    palette = img.getpalette()
-
-    colors = []
-    for color in range(1 << bits):
-        color565 = (
-            ((palette[color*3] & 0xF8) << 8)
-            | ((palette[color*3+1] & 0xFC) << 3)
-            | (palette[color*3+2] >> 3)
+    if bits == 1:
+        buf = img.tobytes()
+        row_bytes = (img.width + 7) // 8
+
+        if img.width % 8 == 0:
+            packed_bytes = buf
+        elif np is not None:
+            # Mode "1" rows are padded to whole bytes; strip the padding
+            # and repack into one continuous bit stream.
+            rows = np.unpackbits(
+                np.frombuffer(buf, dtype=np.uint8).reshape(img.height, row_bytes), axis=1)
+            packed = np.packbits(rows[:, :img.width].reshape(-1))
+
+            if bitmap_bits % 8:
+                packed[-1] >>= 8 - bitmap_bits % 8
+
+            packed_bytes = packed.tobytes()
+        else:
+            # Same padding strip in pure Python.
+            image_bitstring = ''.join(
+                ''.join(f'{byte:08b}' for byte in buf[r*row_bytes:(r+1)*row_bytes])[:img.width]
+                for r in range(img.height)
+            )
+            packed_bytes = bytes(
+                int(image_bitstring[i:i+8], 2)
+                for i in range(0, bitmap_bits, 8)
+            )
+    elif np is not None:
+        # Wrap the raw palette-index buffer at zero copy, then unpack/repack
+        # the pixel bits in C instead of doing it per pixel in Python.
+        arr = np.frombuffer(img.tobytes(), dtype=np.uint8)
+        pixel_bits = np.unpackbits(arr[:, np.newaxis], axis=1)[:, 8 - bits:]
+        packed = np.packbits(pixel_bits.reshape(-1))
+
+        # packbits pads a trailing partial byte on the right; the old
+        # int(value, 2) conversion right-aligned it, so shift to match.
+        if bitmap_bits % 8:
+            packed[-1] >>= 8 - bitmap_bits % 8
+
+        packed_bytes = packed.tobytes()
+    else:
+        # Pure-Python fallback: hoist the bit masks out of the pixel loop,
+        # iterate the raw index buffer instead of getpixel() per coordinate,
+        # and join once at the end instead of growing a string per bit.
+        masks = tuple(1 << b for b in range(bits - 1, -1, -1))
+        parts = []
+        for pixel in img.tobytes():
+            for m in masks:
+                parts.append('1' if pixel & m else '0')
+        image_bitstring = ''.join(parts)
+
+        packed_bytes = bytes(
+            int(image_bitstring[i:i+8], 2)
+            for i in range(0, bitmap_bits, 8)
         )
 
-        # swap bytes
-        color565 = ((color565 & 0xff) << 8) + ((color565 & 0xff00) >> 8)
-        colors.append(f'0x{color565:04x}')
-
-    image_bitstring = ''
-
-    for y in range(img.height):
-        for x in range(img.width):
-            pixel = img.getpixel((x, y))
-            for bit in range(bits, 0, -1):
-                image_bitstring += '1' if (pixel & (1 << bit-1)) else '0'
-
-    bitmap_bits = len(image_bitstring)
-
-    with open(out_path, "w") as f:
+    # Large buffer so the per-line writes don't turn into small syscalls.
+    with open(out_path, "w", buffering=1 << 20) as f:
 
         f.write(f'HEIGHT = {img.height}\n')
         f.write(f'WIDTH = {img.width}\n')
@@ -89,22 +178,49 @@ def main():
         f.write(','.join(colors))
         f.write(']\n\n')
 
-        f.write("_bitmap = \\\n")
-        f.write("b'")
+        if args.raw:
+            # The bitmap lives in a raw sidecar file; the module just loads
+            # it. Much smaller than the \xNN literal and written in one call.
+            bin_path = out_path.with_suffix('.bin')
+            bin_path.write_bytes(packed_bytes)
+
+            f.write(f"_bitmap = open('{bin_path.name}', 'rb').read()\n")
+            f.write("BITMAP = memoryview(_bitmap)\n")
+        else:
+            f.write("_bitmap = \\\n")
+            f.write("b'")
 
-        for i in range(0, bitmap_bits, 8):
+            if np is not None:
+                # Escape the whole buffer at once via the lookup table, then
+                # write it out in 16-byte (64-character) lines.
+                escaped = _ESC_NP[
+                    np.frombuffer(packed_bytes, dtype=np.uint8)
+                ].tobytes().decode('ascii')
 
-            if i and i % (16*8) == 0:
-                f.write("'\\\nb'")
+                for i in range(0, len(escaped), 64):
 
-            value = image_bitstring[i:i+8]
-            color = int(value, 2)
-            f.write(f'\\x{color:02x}')
+                    if i:
+                        f.write("'\\\nb'")
 
-        f.write("'\n")
-        f.write("BITMAP = memoryview(_bitmap)\n")
+                    f.write(escaped[i:i+64])
+            else:
+                # One hex() pass over the buffer, then one write per 16-byte
+                # line instead of a format() call and write per byte.
+                hx = packed_bytes.hex()
+                for i in range(0, len(hx), 32):
 
-    print(f"Wrote {out_path}")
+                    if i:
+                        f.write("'\\\nb'")
+
+                    f.write(''.join('\\x' + hx[k:k+2] for k in range(i, min(i + 32, len(hx)), 2)))
+
+            f.write("'\n")
+            f.write("BITMAP = memoryview(_bitmap)\n")
+
+    if args.raw:
+        print(f"Wrote {out_path} and {out_path.with_suffix('.bin')}")
+    else:
+        print(f"Wrote {out_path}")
 
 
 if __name__ == "__main__":
@@ -8,20 +8,70 @@ Dear PyGui front-end for imgtobitmap.
 - Click "Convert" to generate the bitmap module
 """
 
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 from PIL import Image
 import dearpygui.dearpygui as dpg
 import tkinter as tk
 from tkinter import filedialog
 
+# Escaped form of every possible bitmap byte, built once at import: turning
+# bytes into \xNN tokens is then a list index + join with no format() calls.
+_HEX_ESC = [f"\\x{i:02x}" for i in range(256)]
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None  # optional; the NumPy unpackbits/packbits path is used instead
+
+
+if njit is not None:
+    @njit(cache=True, parallel=True)
+    def _pack_bitmap(indices, bits, out):
+        """
+        Pack `bits` bits per palette index from `indices` into `out`,
+        big-endian. Parallel over output bytes, so no two iterations
+        touch the same byte.
+        """
+        total_bits = indices.size * bits
+        for j in prange(out.size):
+            acc = 0
+            for k in range(8):
+                pos = j * 8 + k
+                if pos < total_bits:
+                    pixel = indices[pos // bits]
+                    if pixel & (1 << (bits - 1 - pos % bits)):
+                        acc |= 0x80 >> k
+            out[j] = acc
+else:
+    _pack_bitmap = None
+
+# Creating a Tk root spins up a whole Tcl interpreter, so do it once and
+# reuse it for every file-picker call; it is torn down at process exit.
+_tk_root = None
+_tk_lock = threading.Lock()
+
+
+def _get_tk_root():
+    global _tk_root
+    with _tk_lock:
+        if _tk_root is None:
+            _tk_root = tk.Tk()
+            _tk_root.withdraw()  # hide the root Tk window
+            atexit.register(_tk_root.destroy)
+    return _tk_root
+
+
 def open_system_file_picker():
-    # Hide the root Tk window
-    root = tk.Tk()
-    root.withdraw()
+    root = _get_tk_root()
     root.attributes("-topmost", True)
 
     file_path = filedialog.askopenfilename(
+        parent=root,
         title="Select image",
         filetypes=[
             ("Image files", "*.png *.jpg *.jpeg *.bmp *.gif"),
@@ -29,8 +79,6 @@ def open_system_file_picker():
         ]
     )
 
-    root.destroy()
-
     if file_path:
         dpg.set_value("image_path_input", file_path)
 
@@ -40,13 +88,16 @@ def open_system_file_picker():
             dpg.set_value("output_path_input", suggested)
 # -------- Core conversion logic (adapted from CLI script) --------
 
-def convert_image_to_bitmap(image_file: str, bits_per_pixel: int, output: str | None = None) -> Path:
+def convert_image_to_bitmap(image_file: str, bits_per_pixel: int, output: str | None = None,
+                            raw: bool = False) -> Path:
     """
     Convert an image to a Python module with bitmap data.
 
     :param image_file: Path to the source image.
     :param bits_per_pixel: Bits per pixel (1..8).
     :param output: Optional output .py path; if None, derive from image name.
+    :param raw: Write the bitmap to a raw .bin sidecar the module loads,
+        instead of inlining it as a bytes literal.
     :return: Path to the written .py file.
     """
     if bits_per_pixel < 1 or bits_per_pixel > 8:
@@ -65,71 +116,113 @@ def convert_image_to_bitmap(image_file: str, bits_per_pixel: int, output: str |
     img = Image.open(img_path)
     bits = bits_per_pixel
 
+    bitmap_bits = img.width * img.height * bits
+
     if bits == 1:
         # Force strict black/white threshold (same as original script)
         img = img.convert("L")  # grayscale
-        img = img.point(lambda p: 255 if p > 127 else 0, mode='1')
-        img = img.convert("P")
-
-        # Force palette manually: index 0 = black, 1 = white
-        img.putpalette(
-            [
-                0, 0, 0,       # black
-                255, 255, 255  # white
-            ] + [0, 0, 0] * 254
-        )
+        # Prebuilt 256-entry LUT: PIL consumes it directly in C instead of
+        # calling a Python lambda per gray level.
+        img = img.point([0] * 128 + [255] * 128, mode='1')
+
+        # Mode "1" is already an MSB-first packed bitmap, and its two-entry
+        # palette is fixed: index 0 = black, 1 = white.
+        colors = ["0x0000", "0xffff"]
+
+        buf = np.frombuffer(img.tobytes(), dtype=np.uint8)
+        if img.width % 8:
+            # Mode "1" rows are padded to whole bytes; strip the padding and
+            # repack into one continuous bit stream.
+            rows = np.unpackbits(buf.reshape(img.height, -1), axis=1)
+            packed = np.packbits(rows[:, :img.width].reshape(-1))
+        else:
+            packed = buf
     else:
-        # Palette-based conversion with 2**bits colors
-        img = img.convert("P", palette=Image.ADAPTIVE, colors=2**bits)
+        # Already-paletted inputs whose indices fit in 2**bits colors can
+        # skip the ADAPTIVE median-cut re-quantization entirely.
+        used = img.getcolors(maxcolors=1 << bits) if img.mode == "P" else None
+        if used is None or max(index for _, index in used) >= 1 << bits:
+            # Palette-based conversion with 2**bits colors
+            img = img.convert("P", palette=Image.ADAPTIVE, colors=2**bits)
 
-    palette = img.getpalette()
+        palette = img.getpalette()
+
+        # Zero-pad: newer Pillow versions return only the used palette entries.
+        pal = np.zeros(3 * (1 << bits), dtype=np.uint8)
+        entries = palette[:pal.size]
+        pal[:len(entries)] = entries
+        pal = pal.reshape(-1, 3)
 
-    colors = []
-    for color in range(1 << bits):
         color565 = (
-            ((palette[color * 3] & 0xF8) << 8)
-            | ((palette[color * 3 + 1] & 0xFC) << 3)
-            | (palette[color * 3 + 2] >> 3)
+            ((pal[:, 0] & 0xF8).astype(np.uint16) << 8)
+            | ((pal[:, 1] & 0xFC).astype(np.uint16) << 3)
+            | (pal[:, 2] >> 3)
         )
 
         # swap bytes (endian swap)
-        color565 = ((color565 & 0xff) << 8) + ((color565 & 0xff00) >> 8)
-        colors.append(f'0x{color565:04x}')
+        color565 = color565.byteswap()
+        colors = [f'0x{c:04x}' for c in color565.tolist()]
+
+        # Wrap the raw palette-index buffer at zero copy and unpack/repack the
+        # bits in C instead of looping over every pixel in Python.
+        arr = np.frombuffer(img.tobytes(), dtype=np.uint8)
 
-    image_bitstring = ""
+        if _pack_bitmap is not None:
+            packed = np.zeros((bitmap_bits + 7) // 8, dtype=np.uint8)
+            _pack_bitmap(arr, bits, packed)
+        else:
+            pixel_bits = np.unpackbits(arr[:, np.newaxis], axis=1)[:, 8 - bits:]
+            packed = np.packbits(pixel_bits.reshape(-1))
 
-    for y in range(img.height):
-        for x in range(img.width):
-            pixel = img.getpixel((x, y))
-            for bit in range(bits, 0, -1):
-                image_bitstring += "1" if (pixel & (1 << bit - 1)) else "0"
+    # packbits pads a trailing partial byte on the right; the old int(value, 2)
+    # conversion right-aligned it instead, so shift to keep identical output.
+    if bitmap_bits % 8:
+        packed[-1] >>= 8 - bitmap_bits % 8
 
-    bitmap_bits = len(image_bitstring)
+    packed_bytes = packed.tobytes()
 
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    with out_path.open("w", encoding="utf-8") as f:
-        f.write(f"HEIGHT = {img.height}\n")
-        f.write(f"WIDTH = {img.width}\n")
-        f.write(f"COLORS = {1 << bits}\n")
-        f.write(f"BITS = {bitmap_bits}\n")
-        f.write(f"BPP = {bits}\n")
-        f.write("PALETTE = [")
-        f.write(",".join(colors))
-        f.write("]\n\n")
-
-        f.write("_bitmap = \\\n")
-        f.write("b'")
-
-        for i in range(0, bitmap_bits, 8):
-            if i and i % (16 * 8) == 0:
-                f.write("'\\\nb'")
-            value = image_bitstring[i:i + 8]
-            color = int(value, 2)
-            f.write(f"\\x{color:02x}")
-
-        f.write("'\n")
-        f.write("BITMAP = memoryview(_bitmap)\n")
+    header = (
+        f"HEIGHT = {img.height}\n"
+        f"WIDTH = {img.width}\n"
+        f"COLORS = {1 << bits}\n"
+        f"BITS = {bitmap_bits}\n"
+        f"BPP = {bits}\n"
+        "PALETTE = [" + ",".join(colors) + "]\n\n"
+    )
+
+    if raw:
+        # The bitmap lives in a raw sidecar file; the module just loads it.
+        # Much smaller than the \xNN literal and written in one call.
+        bin_path = out_path.with_suffix(".bin")
+        bin_path.write_bytes(packed_bytes)
+
+        body = (
+            header
+            + f"_bitmap = open('{bin_path.name}', 'rb').read()\n"
+            + "BITMAP = memoryview(_bitmap)\n"
+        )
+    else:
+        # Build the whole module as one string and write it in a single call
+        # instead of thousands of small writes through the text-IO layer.
+        # Each byte's \xNN token comes straight from the precomputed table.
+        lines = [
+            "".join(_HEX_ESC[b] for b in packed_bytes[i:i + 16])
+            for i in range(0, len(packed_bytes), 16)
+        ]
+
+        body = (
+            header
+            + "_bitmap = \\\n"
+            + "b'" + "'\\\nb'".join(lines) + "'\n"
+            + "BITMAP = memoryview(_bitmap)\n"
+        )
+
+    # All output is ASCII: encode once and write the bytes directly, skipping
+    # the text-IO layer's incremental UTF-8 codec.
+    with out_path.open("wb") as f:
+        f.write(body.encode("ascii"))
 
     return out_path
 
@@ -161,10 +254,40 @@ def file_dialog_callback(sender, app_data):
             dpg.set_value("output_path_input", out_path)
 
 
+# Conversion runs on a worker so large images don't freeze the UI; the GIL
+# is released inside the Pillow/NumPy C calls doing the heavy lifting.
+_executor = ThreadPoolExecutor(max_workers=2)
+
+
+def _poll_conversion(future, raw):
+    """Check the running conversion once per frame until it finishes."""
+    if not future.done():
+        dpg.set_frame_callback(
+            dpg.get_frame_count() + 1,
+            callback=lambda: _poll_conversion(future, raw),
+        )
+        return
+
+    dpg.configure_item("convert_button", enabled=True)
+
+    try:
+        out_path = future.result()
+    except FileNotFoundError as e:
+        append_log(f"ERROR: {e}")
+    except Exception as e:
+        append_log(f"ERROR: {type(e).__name__}: {e}")
+    else:
+        if raw:
+            append_log(f"SUCCESS: Wrote {out_path} and {out_path.with_suffix('.bin')}")
+        else:
+            append_log(f"SUCCESS: Wrote {out_path}")
+
+
 def convert_button_callback(sender, app_data):
     image_path = dpg.get_value("image_path_input").strip()
     output_path = dpg.get_value("output_path_input").strip()
     bpp = dpg.get_value("bpp_slider")
+    raw = dpg.get_value("raw_checkbox")
 
     dpg.set_value("status_log", "")  # clear log for this run
 
@@ -172,25 +295,22 @@ def convert_button_callback(sender, app_data):
         append_log("ERROR: Please select an image file first.")
         return
 
-    try:
-        append_log(f"Converting:\n  Image: {image_path}\n  BPP: {bpp}")
-        if output_path:
-            append_log(f"  Output: {output_path}")
-        else:
-            append_log("  Output: <image>.py (auto)")
-
-        out_path = convert_image_to_bitmap(
-            image_file=image_path,
-            bits_per_pixel=bpp,
-            output=output_path if output_path else None,
-        )
+    append_log(f"Converting:\n  Image: {image_path}\n  BPP: {bpp}")
+    if output_path:
+        append_log(f"  Output: {output_path}")
+    else:
+        append_log("  Output: <image>.py (auto)")
 
-        append_log(f"SUCCESS: Wrote {out_path}")
+    dpg.configure_item("convert_button", enabled=False)
 
-    except FileNotFoundError as e:
-        append_log(f"ERROR: {e}")
-    except Exception as e:
-        append_log(f"ERROR: {type(e).__name__}: {e}")
+    future = _executor.submit(
+        convert_image_to_bitmap,
+        image_file=image_path,
+        bits_per_pixel=bpp,
+        output=output_path if output_path else None,
+        raw=raw,
+    )
+    _poll_conversion(future, raw)
 
 
 def main():
@@ -228,8 +348,14 @@ def main():
             hint="Leave blank to use <image>.py"
         )
 
+        dpg.add_checkbox(
+            label="Raw .bin sidecar (smaller, copy the .bin along with the .py)",
+            tag="raw_checkbox",
+            default_value=False
+        )
+
         dpg.add_spacing(count=2)
-        dpg.add_button(label="Convert", width=120, callback=convert_button_callback)
+        dpg.add_button(label="Convert", tag="convert_button", width=120, callback=convert_button_callback)
         dpg.add_separator()
         dpg.add_text("Status / Log:")
         dpg.add_input_text(